@@ -1,5 +1,327 @@
+import numbers
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+from scipy import sparse
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn import preprocessing
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing._data import _handle_zeros_in_scale
+from sklearn.utils.extmath import _incremental_mean_and_var
+from sklearn.utils.sparsefuncs import (inplace_column_scale,
+                                       mean_variance_axis,
+                                       incr_mean_variance_axis)
+from sklearn.utils.validation import (check_is_fitted, FLOAT_DTYPES,
+                                      _deprecate_positional_args)
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+try:
+    import numba
+    from numba import njit, prange
+except ImportError:
+    numba = None
+    njit = None
+
+
+# Below this number of elements, spreading the standardization over several
+# threads costs more than it saves
+_PARALLEL_MIN_SIZE = 1 << 16
+
+# Below this number of elements, the NumPy and numexpr paths are as fast as
+# the numba kernels, and small inputs never pay for compiling them
+_NUMBA_MIN_SIZE = 1 << 14
+
+
+if njit is not None:
+    def _standardize_rows(X, mean, inv_scale):
+        n, d = X.shape
+        for i in prange(n):
+            row = X[i]
+            for j in range(d):
+                row[j] = (row[j] - mean[j]) * inv_scale[j]
+
+    # Compiled for the host CPU, so the inner loop is vectorized with the
+    # widest SIMD instructions available (AVX2/FMA, NEON, ...) as long as
+    # X, mean and inv_scale are contiguous and share the same dtype.
+    # The compiled kernels are cached on disk so that only the first
+    # process to call them pays for the compilation.
+    _standardize_kernel = njit(parallel=True, fastmath=True,
+                               error_model='numpy',
+                               cache=True)(_standardize_rows)
+    _standardize_kernel_serial = njit(fastmath=True, error_model='numpy',
+                                      cache=True)(_standardize_rows)
+
+    # No fastmath here: it would let LLVM drop the NaN checks.
+    @njit(parallel=True, error_model='numpy', cache=True)
+    def _welford_kernel(X, block):
+        n_samples, n_features = X.shape
+        count = np.zeros(n_features, dtype=np.int64)
+        mean = np.zeros(n_features)
+        m2 = np.zeros(n_features)
+        # Each thread owns a block of columns and walks it row by row, so
+        # the reads stay sequential for row-major X
+        for b in prange((n_features + block - 1) // block):
+            start = b * block
+            stop = min(start + block, n_features)
+            for i in range(n_samples):
+                for j in range(start, stop):
+                    x = X[i, j]
+                    if np.isnan(x):
+                        continue
+                    count[j] += 1
+                    delta = x - mean[j]
+                    mean[j] += delta / count[j]
+                    m2[j] += delta * (x - mean[j])
+        return mean, m2, count
+
+    # Reassociation and FMA contraction only: NaNs must still propagate to
+    # the sums so that the caller can detect them.
+    @njit(parallel=True, fastmath={'reassoc', 'contract'},
+          error_model='numpy', cache=True)
+    def _sum_sumsq_kernel(X, block):
+        n_samples, n_features = X.shape
+        sum_ = np.zeros(n_features)
+        sum_sq = np.zeros(n_features)
+        for b in prange((n_features + block - 1) // block):
+            start = b * block
+            stop = min(start + block, n_features)
+            for i in range(n_samples):
+                for j in range(start, stop):
+                    x = X[i, j]
+                    sum_[j] += x
+                    sum_sq[j] += x * x
+        return sum_, sum_sq
+
+
+@contextmanager
+def _numba_num_threads(n_jobs):
+    """Run the numba kernels called in this context on ``n_jobs`` threads."""
+    previous = numba.get_num_threads()
+    numba.set_num_threads(min(effective_n_jobs(n_jobs),
+                              numba.config.NUMBA_NUM_THREADS))
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous)
+
+
+def _apply_standardize(X, mean, inv_scale, with_mean, with_std,
+                       tile_bytes=1 << 18, n_jobs=None):
+    """Center and scale the dense array X inplace, in a single pass when
+    numba or, failing that, numexpr is available. Scaling multiplies by the
+    precomputed reciprocal ``inv_scale`` instead of dividing by the scale.
+    On the NumPy fallback, a C-contiguous X is processed in tiles of about
+    ``tile_bytes`` bytes so that each tile stays in cache between the
+    centering and the scaling. The numba kernel splits the rows over
+    ``n_jobs`` threads when X is large enough.
+    """
+    if not (with_mean or with_std):
+        return X
+
+    # Cast the small vectors to the dtype of X rather than letting the
+    # ufuncs cast X through buffers while broadcasting
+    n_features = X.shape[1]
+    if with_mean:
+        mean = np.require(mean, dtype=X.dtype, requirements='C')
+    if with_std:
+        inv_scale = np.require(inv_scale, dtype=X.dtype, requirements='C')
+
+    if (njit is not None and X.flags.c_contiguous and
+            X.size >= _NUMBA_MIN_SIZE):
+        if not with_mean:
+            mean = np.zeros(n_features, dtype=X.dtype)
+        if not with_std:
+            inv_scale = np.ones(n_features, dtype=X.dtype)
+        if X.size < _PARALLEL_MIN_SIZE or effective_n_jobs(n_jobs) == 1:
+            _standardize_kernel_serial(X, mean, inv_scale)
+        else:
+            with _numba_num_threads(n_jobs):
+                _standardize_kernel(X, mean, inv_scale)
+    elif (numexpr is not None and X.flags.c_contiguous and
+            X.dtype in (np.float32, np.float64)):
+        if with_mean and with_std:
+            expr = "(X - mean) * inv_scale"
+        elif with_mean:
+            expr = "X - mean"
+        else:
+            expr = "X * inv_scale"
+        # numexpr already works through X in cache-sized blocks
+        numexpr.evaluate(expr, local_dict={'X': X, 'mean': mean,
+                                           'inv_scale': inv_scale},
+                         out=X, casting='same_kind')
+    else:
+        # Row tiles are only contiguous, and worth it, for row-major X
+        if X.flags.c_contiguous:
+            n_rows = max(1, tile_bytes // (n_features * X.itemsize))
+        else:
+            n_rows = X.shape[0]
+        for start in range(0, X.shape[0], n_rows):
+            tile = X[start:start + n_rows]
+            if with_mean:
+                np.subtract(tile, mean, out=tile)
+            if with_std:
+                np.multiply(tile, inv_scale, out=tile)
+    return X
+
+
+def _apply_inverse_standardize(X, mean, scale, with_mean, with_std, out):
+    """Compute ``X * scale + mean`` into ``out``, which may be X itself, in
+    a single pass when numexpr is available.
+    """
+    if not (with_mean or with_std):
+        if out is not X:
+            out[...] = X
+        return out
+
+    if (numexpr is not None and X.flags.c_contiguous and
+            out.flags.c_contiguous and X.dtype in (np.float32, np.float64)):
+        if with_mean and with_std:
+            expr = "X * scale + mean"
+        elif with_mean:
+            expr = "X + mean"
+        else:
+            expr = "X * scale"
+        numexpr.evaluate(expr, local_dict={'X': X, 'mean': mean,
+                                           'scale': scale},
+                         out=out, casting='same_kind')
+    elif with_std:
+        np.multiply(X, scale, out=out)
+        if with_mean:
+            np.add(out, mean, out=out)
+    else:
+        np.add(X, mean, out=out)
+    return out
+
+
+def _csc_nan_col_counts(X):
+    """Number of NaNs stored in each column of the CSC matrix X."""
+    nan_data = np.isnan(X.data)
+    counts = np.zeros(X.shape[1], dtype=np.int64)
+    # `reduceat` does not handle empty segments, skip the empty columns
+    non_empty = np.diff(X.indptr) > 0
+    if nan_data.size:
+        counts[non_empty] = np.add.reduceat(
+            nan_data, X.indptr[:-1][non_empty], dtype=np.int64)
+    return counts
+
+
+def _csr_nan_col_counts(X):
+    """Number of NaNs stored in each column of the CSR matrix X."""
+    nan_indices = X.indices[np.isnan(X.data)]
+    return np.bincount(nan_indices, minlength=X.shape[1]).astype(np.int64,
+                                                                  copy=False)
+
+
+def _chunked_incremental_mean_and_var(X, last_mean, last_variance,
+                                      last_sample_count, chunk_size):
+    """Fold X into the running mean and variance one block of rows at a time.
+    Each block of a row-major X, and the temporaries computed from it, stay
+    in cache while it is reduced. Fortran-ordered arrays are reduced in a
+    single call since each column is already contiguous.
+    """
+    if X.flags.f_contiguous or X.size <= chunk_size:
+        return _incremental_mean_and_var(X, last_mean, last_variance,
+                                         last_sample_count)
+
+    step = max(1, chunk_size // X.shape[1])
+    for start in range(0, X.shape[0], step):
+        if start:
+            # Features that were all-NaN in the previous blocks have a NaN
+            # mean, which would leak into this one through NaN * 0
+            empty = last_sample_count == 0
+            if empty.any():
+                last_mean = np.where(empty, 0., last_mean)
+                if last_variance is not None:
+                    last_variance = np.where(empty, 0., last_variance)
+        last_mean, last_variance, last_sample_count = \
+            _incremental_mean_and_var(X[start:start + step], last_mean,
+                                      last_variance, last_sample_count)
+    return last_mean, last_variance, last_sample_count
+
+
+def _aligned_copy(a, dtype, alignment=32):
+    """Copy of the 1d array ``a`` as ``dtype``, starting on an ``alignment``
+    bytes boundary so that SIMD loads never straddle it.
+    """
+    a = np.asarray(a, dtype=dtype)
+    buf = np.empty(a.nbytes + alignment, dtype=np.uint8)
+    offset = -buf.ctypes.data % alignment
+    out = buf[offset:offset + a.nbytes].view(dtype)
+    out[...] = a
+    return out
+
+
+def _combine_mean_and_var(last_mean, last_variance, last_sample_count,
+                          new_mean, new_m2, new_sample_count):
+    """Merge the statistics of a new batch into the running ones using the
+    pairwise update of Chan, Golub and LeVeque.
+    """
+    updated_sample_count = last_sample_count + new_sample_count
+
+    # Features that are still all-NaN end up with NaN statistics, as in
+    # `_incremental_mean_and_var`
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = new_sample_count / updated_sample_count
+        delta = new_mean - last_mean
+        updated_mean = last_mean + delta * ratio
+        if last_variance is None:
+            updated_variance = None
+        else:
+            updated_m2 = (last_variance * last_sample_count + new_m2 +
+                          delta ** 2 * last_sample_count * ratio)
+            updated_variance = updated_m2 / updated_sample_count
+
+    return updated_mean, updated_variance, updated_sample_count
+
+
+def _welford_incremental_mean_and_var(X, last_mean, last_variance,
+                                      last_sample_count, block=64,
+                                      n_jobs=None):
+    """Single pass replacement for `_incremental_mean_and_var`.
+    The statistics of X are computed with Welford's algorithm, ignoring
+    NaNs, and then combined with the previous ones.
+    """
+    with _numba_num_threads(n_jobs):
+        new_mean, new_m2, new_sample_count = _welford_kernel(X, block)
+    return _combine_mean_and_var(last_mean, last_variance, last_sample_count,
+                                 new_mean, new_m2, new_sample_count)
+
+
+def _sum_sumsq_incremental_mean_and_var(X, last_mean, last_variance,
+                                        last_sample_count, block=64,
+                                        n_jobs=None):
+    """Fast, less stable replacement for `_incremental_mean_and_var`.
+    The statistics of X are derived from its per-feature sums and sums of
+    squares, computed in a single pass, and then combined with the previous
+    ones. Returns None when X is not finite, since NaNs would have to be
+    skipped.
+    """
+    if njit is not None and X.size >= _NUMBA_MIN_SIZE:
+        with _numba_num_threads(n_jobs):
+            sum_, sum_sq = _sum_sumsq_kernel(X, block)
+    else:
+        sum_ = X.sum(axis=0, dtype=np.float64)
+        sum_sq = np.einsum('ij,ij->j', X, X, dtype=np.float64)
+    if not np.isfinite(sum_).all():
+        return None
+
+    n_samples = X.shape[0]
+    new_mean = sum_ / n_samples
+    # Cancellation can make the difference slightly negative
+    new_m2 = np.maximum(sum_sq - sum_ * new_mean, 0.)
+    return _combine_mean_and_var(last_mean, last_variance, last_sample_count,
+                                 new_mean, new_m2, n_samples)
 
 
 # All sklearn Transforms must have the `transform` and `fit` methods
@@ -7,14 +329,47 @@ class DropColumns(BaseEstimator, TransformerMixin):
     def __init__(self, columns):
         self.columns = columns
 
+    def _drop_set(self, columns):
+        # Assim como o `drop`, aceitamos um único rótulo e recusamos
+        # rótulos que não existem em `columns`
+        labels = (self.columns if pd.api.types.is_list_like(self.columns)
+                  else [self.columns])
+        missing = [c for c in labels if c not in columns]
+        if missing:
+            raise KeyError("%s not found in axis" % missing)
+        return frozenset(labels)
+
     def fit(self, X, y=None):
+        # Guardamos uma única vez as posições das colunas que devem ser
+        # mantidas, evitando resolver os rótulos a cada chamada de transform
+        drop_set = self._drop_set(X.columns)
+        self._fit_columns = X.columns
+        self._keep_iloc = np.fromiter(
+            (i for i, c in enumerate(X.columns) if c not in drop_set),
+            dtype=np.intp)
+        self._kept_names = X.columns[self._keep_iloc]
         return self
 
     def transform(self, X):
-        # Primeiro realizamos a cópia do dataframe 'X' de entrada
-        data = X.copy()
-        # Retornamos um novo dataframe sem as colunas indesejadas
-        return data.drop(labels=self.columns, axis='columns')
+        # Sem fit, ou se as colunas mudaram desde o fit, as posições não
+        # valem e selecionamos pelos rótulos
+        if (not hasattr(self, '_fit_columns') or
+                not X.columns.equals(self._fit_columns)):
+            drop_set = self._drop_set(X.columns)
+            return X.loc[:, ~X.columns.isin(list(drop_set))]
+        # Com um único bloco numérico, `values` é uma view e o `take`
+        # copia apenas as colunas mantidas. Com vários blocos, `values`
+        # consolidaria todas as colunas, e dtypes de extensão do pandas
+        # (`Int64`, `Float64`, ...) virariam `object`
+        dtypes = X.dtypes.unique()
+        if (X._mgr.nblocks == 1 and isinstance(dtypes[0], np.dtype) and
+                dtypes[0].kind in 'biuf'):
+            arr = X.values.take(self._keep_iloc, axis=1)
+            return pd.DataFrame(arr, index=X.index, columns=self._kept_names,
+                                copy=False)
+        # Retornamos apenas as colunas mantidas, sem copiar o dataframe
+        # inteiro nem passar pelo `drop`
+        return X.iloc[:, self._keep_iloc]
 
 class StandardScaler(TransformerMixin, BaseEstimator):
     """Standardize features by removing the mean and scaling to unit variance
@@ -57,6 +412,27 @@ class StandardScaler(TransformerMixin, BaseEstimator):
     with_std : boolean, True by default
         If True, scale the data to unit variance (or equivalently,
         unit standard deviation).
+    dtype : numpy dtype, optional (default: None)
+        Floating point dtype of ``mean_``, ``scale_`` and of the transformed
+        data. Passing ``np.float32`` halves the memory moved by
+        :meth:`transform` on large matrices. ``var_`` stays in float64, so
+        that later calls to :meth:`partial_fit` keep their precision. If
+        None, float32 and float64 inputs keep their dtype and anything else
+        is converted to float64.
+    stable_variance : boolean, True by default
+        If False, dense batches without missing values are fitted from the
+        per-feature sums and sums of squares in a single pass, using
+        ``var = E[x**2] - E[x]**2``. This is faster but loses precision
+        for features whose mean is large compared to their standard
+        deviation. Batches containing NaNs always use the stable algorithm.
+    n_jobs : int or None, optional (default: None)
+        Number of threads used by the numba kernels of :meth:`partial_fit`
+        and :meth:`transform`, when numba is installed. ``None`` means 1
+        unless in a :obj:`joblib.parallel_backend` context, ``-1`` means
+        using all processors. Inputs with fewer than ``2 ** 16`` elements
+        are always transformed on a single thread. Without numba,
+        :meth:`transform` uses numexpr if installed, whose thread pool is
+        configured through numexpr itself and ignores ``n_jobs``.
     Attributes
     ----------
     scale_ : ndarray or None, shape (n_features,)
@@ -109,11 +485,21 @@ class StandardScaler(TransformerMixin, BaseEstimator):
     <sphx_glr_auto_examples_preprocessing_plot_all_scaling.py>`.
     """  # noqa
 
+    # Number of elements reduced at once by the dense branch of partial_fit
+    _FIT_CHUNK_SIZE = 1 << 18
+    # Size in bytes of the row tiles standardized at once by the NumPy
+    # fallback of transform
+    _TILE_BYTES = 1 << 18
+
     @_deprecate_positional_args
-    def __init__(self, *, copy=True, with_mean=True, with_std=True):
+    def __init__(self, *, copy=True, with_mean=True, with_std=True,
+                 dtype=None, stable_variance=True, n_jobs=None):
         self.with_mean = with_mean
         self.with_std = with_std
         self.copy = copy
+        self.dtype = dtype
+        self.stable_variance = stable_variance
+        self.n_jobs = n_jobs
 
     def _reset(self):
         """Reset internal data-dependent state of the scaler, if necessary.
@@ -124,9 +510,12 @@ class StandardScaler(TransformerMixin, BaseEstimator):
         # in partial_fit
         if hasattr(self, 'scale_'):
             del self.scale_
+            del self._inv_scale_
             del self.n_samples_seen_
             del self.mean_
             del self.var_
+        if hasattr(self, '_fit_columns'):
+            del self._fit_columns
 
     def fit(self, X, y=None):
         """Compute the mean and std to be used for later scaling.
@@ -153,6 +542,9 @@ class StandardScaler(TransformerMixin, BaseEstimator):
         in Chan, Tony F., Gene H. Golub, and Randall J. LeVeque. "Algorithms
         for computing the sample variance: Analysis and recommendations."
         The American Statistician 37.3 (1983): 242-247:
+        Without numba, dense row-major input is reduced in blocks of rows,
+        while large matrices passed in Fortran order (e.g.
+        ``np.asfortranarray(X)``) are reduced in a single call.
         Parameters
         ----------
         X : {array-like, sparse matrix}, shape [n_samples, n_features]
@@ -165,8 +557,15 @@ class StandardScaler(TransformerMixin, BaseEstimator):
         self : object
             Transformer instance.
         """
+        # Keep the columns of the first DataFrame for `transform_many`.
+        # `_validate_data` manages `feature_names_in_` itself, so they are
+        # stored privately.
+        if not hasattr(self, 'scale_') and hasattr(X, 'columns'):
+            self._fit_columns = X.columns
+
+        dtype = FLOAT_DTYPES if self.dtype is None else self.dtype
         X = self._validate_data(X, accept_sparse=('csr', 'csc'),
-                                estimator=self, dtype=FLOAT_DTYPES,
+                                estimator=self, dtype=dtype,
                                 force_all_finite='allow-nan')
 
         # Even in the case of `with_mean=False`, we update the mean anyway
@@ -187,11 +586,10 @@ class StandardScaler(TransformerMixin, BaseEstimator):
                     "Cannot center sparse matrices: pass `with_mean=False` "
                     "instead. See docstring for motivation and alternatives.")
 
-            sparse_constructor = (sparse.csr_matrix
-                                  if X.format == 'csr' else sparse.csc_matrix)
-            counts_nan = sparse_constructor(
-                        (np.isnan(X.data), X.indices, X.indptr),
-                        shape=X.shape).sum(axis=0).A.ravel()
+            if X.format == 'csr':
+                counts_nan = _csr_nan_col_counts(X)
+            else:
+                counts_nan = _csc_nan_col_counts(X)
 
             if not hasattr(self, 'n_samples_seen_'):
                 self.n_samples_seen_ = (
@@ -228,27 +626,77 @@ class StandardScaler(TransformerMixin, BaseEstimator):
             if not self.with_mean and not self.with_std:
                 self.mean_ = None
                 self.var_ = None
-                self.n_samples_seen_ += X.shape[0] - np.isnan(X).sum(axis=0)
+                # Fully finite batches are the common case: `any` lets us
+                # skip the per-column count entirely
+                nan_mask = np.isnan(X)
+                if nan_mask.any():
+                    self.n_samples_seen_ += (
+                        X.shape[0] - np.count_nonzero(nan_mask, axis=0))
+                else:
+                    self.n_samples_seen_ += X.shape[0]
             else:
-                self.mean_, self.var_, self.n_samples_seen_ = \
-                    _incremental_mean_and_var(X, self.mean_, self.var_,
-                                              self.n_samples_seen_)
+                stats = None
+                if not self.stable_variance:
+                    stats = _sum_sumsq_incremental_mean_and_var(
+                        X, self.mean_, self.var_, self.n_samples_seen_,
+                        n_jobs=self.n_jobs)
+                if (stats is None and njit is not None and
+                        X.size >= _NUMBA_MIN_SIZE):
+                    stats = _welford_incremental_mean_and_var(
+                        X, self.mean_, self.var_, self.n_samples_seen_,
+                        n_jobs=self.n_jobs)
+                elif stats is None:
+                    stats = _chunked_incremental_mean_and_var(
+                        X, self.mean_, self.var_, self.n_samples_seen_,
+                        self._FIT_CHUNK_SIZE)
+                self.mean_, self.var_, self.n_samples_seen_ = stats
 
         # for backward-compatibility, reduce n_samples_seen_ to an integer
         # if the number of samples is the same for each feature (i.e. no
-        # missing values)
-        if np.ptp(self.n_samples_seen_) == 0:
-            self.n_samples_seen_ = self.n_samples_seen_[0]
+        # missing values). Comparing the first and last counts rules out
+        # most non-uniform cases before scanning the whole array.
+        n_samples_seen = self.n_samples_seen_
+        if (n_samples_seen[0] == n_samples_seen[-1] and
+                np.all(n_samples_seen == n_samples_seen[0])):
+            self.n_samples_seen_ = n_samples_seen[0]
 
         if self.with_std:
             self.scale_ = _handle_zeros_in_scale(np.sqrt(self.var_))
+            self._inv_scale_ = np.reciprocal(self.scale_,
+                                             dtype=self.scale_.dtype)
         else:
             self.scale_ = None
+            self._inv_scale_ = None
+
+        if self.dtype is not None:
+            if self.mean_ is not None:
+                self.mean_ = self.mean_.astype(self.dtype, copy=False)
+            if self.scale_ is not None:
+                self.scale_ = self.scale_.astype(self.dtype, copy=False)
+                self._inv_scale_ = self._inv_scale_.astype(self.dtype,
+                                                           copy=False)
+
+        if hasattr(self, '_stats_gpu'):
+            del self._stats_gpu
+
+        # Lay out the vectors broadcast by `transform` for SIMD loads. They
+        # keep the dtype of the statistics: `_apply_standardize` casts them
+        # to the dtype of each X it is given.
+        if self.mean_ is not None:
+            self.mean_ = _aligned_copy(self.mean_, self.mean_.dtype)
+        if self._inv_scale_ is not None:
+            self._inv_scale_ = _aligned_copy(self._inv_scale_,
+                                             self.scale_.dtype)
 
         return self
 
     def transform(self, X, copy=None):
         """Perform standardization by centering and scaling
+        C-contiguous float ndarrays with the fitted number of features skip
+        input validation. On that path infinite values are not rejected:
+        making sure X is finite (NaNs aside) is up to the caller.
+        When cupy is installed, arrays exposing ``__cuda_array_interface__``
+        are standardized on their device and returned as cupy arrays.
         Parameters
         ----------
         X : array-like, shape [n_samples, n_features]
@@ -259,9 +707,15 @@ class StandardScaler(TransformerMixin, BaseEstimator):
         check_is_fitted(self)
 
         copy = copy if copy is not None else self.copy
+        if cupy is not None and hasattr(X, '__cuda_array_interface__'):
+            return self._transform_gpu(X, copy)
+        if self._can_fastpath(X, copy):
+            return self._transform_fast(X, copy)
+
+        dtype = FLOAT_DTYPES if self.dtype is None else self.dtype
         X = self._validate_data(X, reset=False,
                                 accept_sparse='csr', copy=copy,
-                                estimator=self, dtype=FLOAT_DTYPES,
+                                estimator=self, dtype=dtype,
                                 force_all_finite='allow-nan')
 
         if sparse.issparse(X):
@@ -270,12 +724,95 @@ class StandardScaler(TransformerMixin, BaseEstimator):
                     "Cannot center sparse matrices: pass `with_mean=False` "
                     "instead. See docstring for motivation and alternatives.")
             if self.scale_ is not None:
-                inplace_column_scale(X, 1 / self.scale_)
+                inplace_column_scale(X, self._inv_scale_)
         else:
-            if self.with_mean:
-                X -= self.mean_
-            if self.with_std:
-                X /= self.scale_
+            X = _apply_standardize(X, self.mean_, self._inv_scale_,
+                                   self.with_mean, self.with_std,
+                                   tile_bytes=self._TILE_BYTES,
+                                   n_jobs=self.n_jobs)
+        return X
+
+    def _can_fastpath(self, X, copy):
+        """Whether X is already in the form `_validate_data` would return."""
+        if not (isinstance(X, np.ndarray) and X.ndim == 2 and
+                X.flags.c_contiguous and (copy or X.flags.writeable)):
+            return False
+        if self.dtype is None:
+            dtype_ok = X.dtype in (np.float32, np.float64)
+        else:
+            dtype_ok = X.dtype == self.dtype
+        return dtype_ok and X.shape[1] == self.n_features_in_
+
+    def _transform_fast(self, X, copy):
+        """Standardize a dense ndarray without validating it first."""
+        if copy:
+            X = X.copy()
+        return _apply_standardize(X, self.mean_, self._inv_scale_,
+                                  self.with_mean, self.with_std,
+                                  tile_bytes=self._TILE_BYTES,
+                                  n_jobs=self.n_jobs)
+
+    def _transform_gpu(self, X, copy):
+        """Standardize a CUDA array without moving it to the host."""
+        X = cupy.asarray(X)
+        # `_validate_data` is skipped on the device, check the shape here
+        if X.ndim != 2:
+            raise ValueError(
+                "Expected 2D array, got %dD array instead." % X.ndim)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                "X has %d features, but StandardScaler is expecting %d "
+                "features as input." % (X.shape[1], self.n_features_in_))
+        if self.dtype is not None:
+            dtype = self.dtype
+        else:
+            dtype = X.dtype if X.dtype.kind == 'f' else np.float64
+        X = X.astype(dtype, copy=copy)
+
+        # Device copies of the statistics are made on the first GPU call
+        # for each dtype and device, and dropped whenever the statistics
+        # change
+        if not hasattr(self, '_stats_gpu'):
+            self._stats_gpu = {}
+        key = (np.dtype(dtype), X.device.id)
+        if key not in self._stats_gpu:
+            with X.device:
+                self._stats_gpu[key] = tuple(
+                    None if stat is None else cupy.asarray(stat, dtype=dtype)
+                    for stat in (self.mean_, self._inv_scale_))
+        mean, inv_scale = self._stats_gpu[key]
+        if self.with_mean:
+            cupy.subtract(X, mean, out=X)
+        if self.with_std:
+            cupy.multiply(X, inv_scale, out=X)
+        return X
+
+    def transform_many(self, X):
+        """Standardize the fitted columns of a DataFrame inplace
+        Meant for online settings where :meth:`transform` is called on many
+        small batches: the columns of the DataFrame first passed to
+        :meth:`fit` or :meth:`partial_fit` are selected by name, so no
+        reordering or DataFrame/array round-trip through validation is
+        needed. Those columns must be numeric; other columns are left
+        untouched.
+        Parameters
+        ----------
+        X : pandas.DataFrame, shape [n_samples, n_columns]
+            The data used to scale along the features axis.
+        Returns
+        -------
+        X : pandas.DataFrame
+            The same DataFrame, with its fitted columns standardized.
+        """
+        check_is_fitted(self)
+        if not hasattr(self, '_fit_columns'):
+            raise ValueError(
+                "transform_many requires the scaler to be fitted on a "
+                "DataFrame.")
+
+        dtype = np.float64 if self.dtype is None else self.dtype
+        arr = X[self._fit_columns].to_numpy(dtype=dtype, copy=True)
+        X[self._fit_columns] = self._transform_fast(arr, copy=False)
         return X
 
     def inverse_transform(self, X, copy=None):
@@ -308,13 +845,26 @@ class StandardScaler(TransformerMixin, BaseEstimator):
                 inplace_column_scale(X, self.scale_)
         else:
             X = np.asarray(X)
-            if copy:
-                X = X.copy()
-            if self.with_std:
-                X *= self.scale_
-            if self.with_mean:
-                X += self.mean_
+            out = np.empty_like(X) if copy else X
+            X = _apply_inverse_standardize(X, self.mean_, self.scale_,
+                                           self.with_mean, self.with_std,
+                                           out)
         return X
 
+    def __getstate__(self):
+        # The device copies are rebuilt on demand and would make the pickle
+        # unloadable without a GPU
+        state = dict(super().__getstate__())
+        state.pop('_stats_gpu', None)
+        return state
+
     def _more_tags(self):
-        return {'allow_nan': True}
\ No newline at end of file
+        return {'allow_nan': True}
+
+
+def make_imputer():
+    """Imputer filling missing values with the most frequent value of each
+    column. A new, unfitted instance is returned on every call.
+    """
+    return SimpleImputer(missing_values=np.nan, strategy='most_frequent',
+                         fill_value=0, copy=True)
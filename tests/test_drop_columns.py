@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from my_custom_sklearn_transforms.sklearn_transformers import DropColumns
+
+
+def _make_frame():
+    return pd.DataFrame({'a': [1, 2, 3], 'b': [4., 5., 6.],
+                         'c': ['x', 'y', 'z']})
+
+
+@pytest.mark.parametrize('columns', ['b', ['b']])
+def test_scalar_and_list_label(columns):
+    X = _make_frame()
+    result = DropColumns(columns).fit(X).transform(X)
+    assert_frame_equal(result, X.drop(columns=columns))
+
+
+def test_unknown_label_raises():
+    X = _make_frame()
+    with pytest.raises(KeyError):
+        DropColumns(['b', 'missing']).fit(X)
+
+    dropper = DropColumns('b').fit(X)
+    with pytest.raises(KeyError):
+        dropper.transform(X[['a', 'c']])
+
+
+def test_column_order_changed_after_fit():
+    X = _make_frame()
+    dropper = DropColumns('b').fit(X)
+    reordered = X[['c', 'b', 'a']]
+    assert_frame_equal(dropper.transform(reordered),
+                       reordered.drop(columns='b'))
+
+
+@pytest.mark.parametrize('fit', [True, False])
+def test_duplicate_labels(fit):
+    X = pd.DataFrame(np.arange(9.).reshape(3, 3), columns=['a', 'a', 'b'])
+    dropper = DropColumns('b')
+    if fit:
+        dropper.fit(X.iloc[:, ::-1])
+    result = dropper.transform(X)
+    assert list(result.columns) == ['a', 'a']
+    np.testing.assert_array_equal(result.to_numpy(), X.to_numpy()[:, :2])
+
+
+def test_unfitted_transform_selects_by_label():
+    X = _make_frame()
+    assert_frame_equal(DropColumns('b').transform(X), X.drop(columns='b'))
+
+
+@pytest.mark.parametrize('dtype', ['Int64', 'Float64', 'boolean'])
+def test_nullable_dtypes_are_kept(dtype):
+    X = pd.DataFrame({'a': [1, None, 0], 'b': [0, 1, None]}, dtype=dtype)
+    result = DropColumns('b').fit(X).transform(X)
+    assert_frame_equal(result, X.drop(columns='b'))
+    assert result.dtypes['a'] == dtype
+
+
+@pytest.mark.parametrize('make_frame', [
+    lambda: pd.DataFrame(np.arange(12.).reshape(3, 4), columns=list('wxyz')),
+    lambda: pd.concat([pd.DataFrame({c: [1., 2., 3.]}) for c in 'wxyz'],
+                      axis=1),
+])
+def test_numeric_frames(make_frame):
+    X = make_frame()
+    result = DropColumns(['x', 'z']).fit(X).transform(X)
+    assert_frame_equal(result, X.drop(columns=['x', 'z']))
@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+from scipy import sparse
+from sklearn.exceptions import NotFittedError
+from sklearn.preprocessing import StandardScaler as SklearnStandardScaler
+
+from my_custom_sklearn_transforms import sklearn_transformers
+from my_custom_sklearn_transforms.sklearn_transformers import StandardScaler
+
+
+@pytest.fixture(params=['default', 'numba_kernels', 'no_numba',
+                        'no_numba_no_numexpr'])
+def backend(request, monkeypatch):
+    """Run each test with and without the optional accelerators."""
+    if request.param == 'numba_kernels':
+        # The test data are too small to reach the kernels otherwise
+        if sklearn_transformers.njit is None:
+            pytest.skip('numba is not installed')
+        monkeypatch.setattr(sklearn_transformers, '_NUMBA_MIN_SIZE', 0)
+    elif request.param != 'default':
+        monkeypatch.setattr(sklearn_transformers, 'njit', None)
+    if request.param == 'no_numba_no_numexpr':
+        monkeypatch.setattr(sklearn_transformers, 'numexpr', None)
+    return request.param
+
+
+def _make_data(dtype=np.float64):
+    rng = np.random.RandomState(0)
+    X = (rng.randn(300, 12) * 5 + 3).astype(dtype)
+    X[::7, 2] = np.nan
+    X[:, 5] = np.nan
+    return X
+
+
+def _assert_same_fit(ours, ref, rtol):
+    for attr in ('mean_', 'var_', 'scale_'):
+        if getattr(ref, attr) is None:
+            assert getattr(ours, attr) is None
+        else:
+            assert_allclose(getattr(ours, attr), getattr(ref, attr),
+                            rtol=rtol)
+    assert_array_equal(ours.n_samples_seen_, ref.n_samples_seen_)
+
+
+@pytest.mark.parametrize('with_mean', [True, False])
+@pytest.mark.parametrize('with_std', [True, False])
+@pytest.mark.parametrize('dtype, rtol', [(np.float64, 1e-10),
+                                         (np.float32, 1e-5)])
+def test_dense_matches_sklearn(backend, with_mean, with_std, dtype, rtol):
+    X = _make_data(dtype)
+    ours = StandardScaler(with_mean=with_mean, with_std=with_std).fit(X)
+    ref = SklearnStandardScaler(with_mean=with_mean, with_std=with_std).fit(X)
+    _assert_same_fit(ours, ref, rtol)
+
+    X_tr = ours.transform(X)
+    assert X_tr.dtype == dtype
+    assert_allclose(X_tr, ref.transform(X), rtol=rtol, atol=rtol)
+    assert_allclose(ours.inverse_transform(X_tr), X, rtol=rtol, atol=rtol)
+
+
+@pytest.mark.parametrize('with_std', [True, False])
+@pytest.mark.parametrize('stable_variance', [True, False])
+def test_partial_fit_matches_sklearn(backend, with_std, stable_variance):
+    X = _make_data()
+    ours = StandardScaler(with_std=with_std, stable_variance=stable_variance)
+    ref = SklearnStandardScaler(with_std=with_std)
+    for batch in np.array_split(X, 4):
+        ours.partial_fit(batch)
+        ref.partial_fit(batch)
+    _assert_same_fit(ours, ref, rtol=1e-9)
+    assert_allclose(ours.transform(X), ref.transform(X), rtol=1e-9)
+
+
+def test_stable_variance_false_finite_input(backend):
+    X = np.random.RandomState(1).randn(500, 8) * 2 + 1
+    ours = StandardScaler(stable_variance=False).fit(X)
+    ref = SklearnStandardScaler().fit(X)
+    _assert_same_fit(ours, ref, rtol=1e-9)
+    assert ours.n_samples_seen_ == 500
+
+
+@pytest.mark.parametrize('with_std', [True, False])
+def test_chunked_fit_leading_nans(backend, with_std):
+    # More than one block of rows, with features that are all-NaN in the
+    # first block(s) and a feature that is all-NaN throughout
+    rng = np.random.RandomState(2)
+    X = rng.rand(100000, 4)
+    assert X.size > StandardScaler._FIT_CHUNK_SIZE
+    X[:70000, 0] = np.nan
+    X[:, 1] = np.nan
+    X[::3, 2] = np.nan
+    ours = StandardScaler(with_std=with_std).fit(X)
+    ref = SklearnStandardScaler(with_std=with_std).fit(X)
+    _assert_same_fit(ours, ref, rtol=1e-9)
+
+
+@pytest.mark.parametrize('stable_variance', [True, False])
+def test_small_input_skips_numba(monkeypatch, stable_variance):
+    if sklearn_transformers.njit is None:
+        pytest.skip('numba is not installed')
+
+    def fail(*args):
+        raise AssertionError('numba kernel called on a small input')
+
+    for name in ('_standardize_kernel', '_standardize_kernel_serial',
+                 '_welford_kernel', '_sum_sumsq_kernel'):
+        monkeypatch.setattr(sklearn_transformers, name, fail)
+    X = np.random.RandomState(3).randn(100, 10)
+    assert X.size < sklearn_transformers._NUMBA_MIN_SIZE
+    ours = StandardScaler(stable_variance=stable_variance).fit(X)
+    ref = SklearnStandardScaler().fit(X)
+    _assert_same_fit(ours, ref, rtol=1e-9)
+    assert_allclose(ours.transform(X), ref.transform(X), rtol=1e-9)
+
+
+@pytest.mark.parametrize('fmt', ['csr', 'csc'])
+@pytest.mark.parametrize('with_std', [True, False])
+def test_sparse_matches_sklearn(backend, fmt, with_std):
+    X = sparse.random(100, 10, density=0.3, format=fmt, random_state=0)
+    X.data[::5] = np.nan
+    ours = StandardScaler(with_mean=False, with_std=with_std)
+    ref = SklearnStandardScaler(with_mean=False, with_std=with_std)
+    for _ in range(2):
+        ours.partial_fit(X)
+        ref.partial_fit(X)
+    _assert_same_fit(ours, ref, rtol=1e-10)
+
+    X_tr = ours.transform(X)
+    assert_allclose(X_tr.toarray(), ref.transform(X).toarray(), rtol=1e-10)
+    assert_allclose(ours.inverse_transform(X_tr).toarray(), X.toarray(),
+                    rtol=1e-10)
+
+
+def test_gpu_stats_follow_input_dtype():
+    cupy = pytest.importorskip('cupy')
+    X = _make_data()[:, [0, 1, 3]]
+    ours = StandardScaler().fit(X)
+    expected = ours.transform(X)
+    for dtype, rtol in [(np.float32, 1e-5), (np.float64, 1e-12)]:
+        X_tr = ours.transform(cupy.asarray(X, dtype=dtype))
+        assert X_tr.dtype == dtype
+        assert_allclose(cupy.asnumpy(X_tr), expected, rtol=rtol, atol=rtol)
+
+
+@pytest.mark.parametrize('with_mean, with_std', [(True, True), (True, False),
+                                                 (False, True)])
+def test_parallel_transform_matches_sklearn(with_mean, with_std):
+    if sklearn_transformers.njit is None:
+        pytest.skip('numba is not installed')
+    X = np.random.RandomState(4).randn(20000, 8) * 3 + 2
+    assert X.size >= sklearn_transformers._PARALLEL_MIN_SIZE
+    n_threads = sklearn_transformers.numba.get_num_threads()
+    ours = StandardScaler(with_mean=with_mean, with_std=with_std, n_jobs=2)
+    ref = SklearnStandardScaler(with_mean=with_mean, with_std=with_std)
+    X_tr = ours.fit(X).transform(X)
+    assert_allclose(X_tr, ref.fit(X).transform(X), rtol=1e-10, atol=1e-10)
+    # The thread count is only changed for the duration of the call
+    assert sklearn_transformers.numba.get_num_threads() == n_threads
+
+
+@pytest.mark.parametrize('X_dtype', [np.float64, np.float32, np.int64])
+def test_dtype_float32(backend, X_dtype):
+    X = np.random.RandomState(5).randint(-50, 50, size=(200, 6))
+    X = X.astype(X_dtype)
+    ours = StandardScaler(dtype=np.float32).fit(X)
+    ref = SklearnStandardScaler().fit(X.astype(np.float64))
+    assert ours.mean_.dtype == np.float32
+    assert ours.scale_.dtype == np.float32
+    assert ours.var_.dtype == np.float64
+    _assert_same_fit(ours, ref, rtol=1e-6)
+
+    X_tr = ours.transform(X)
+    assert X_tr.dtype == np.float32
+    assert_allclose(X_tr, ref.transform(X), rtol=1e-5, atol=1e-5)
+
+
+def test_fastpath_rejections():
+    X = np.random.RandomState(6).randn(50, 3)
+    ours = StandardScaler().fit(X)
+    ref = SklearnStandardScaler().fit(X)
+    expected = ref.transform(X)
+
+    assert ours._can_fastpath(X, copy=False)
+    read_only = X.copy()
+    read_only.flags.writeable = False
+    assert ours._can_fastpath(read_only, copy=True)
+    assert not ours._can_fastpath(read_only, copy=False)
+    for rejected in (X.astype(np.int64), np.asfortranarray(X), X[:, :2],
+                     X[0], X.tolist()):
+        assert not ours._can_fastpath(rejected, copy=True)
+    assert not StandardScaler(dtype=np.float32).fit(X)._can_fastpath(
+        X, copy=True)
+
+    # Rejected inputs go through validation, as with scikit-learn
+    assert_allclose(ours.transform(read_only), expected)
+    with pytest.raises(ValueError, match='read-only'):
+        ours.transform(read_only, copy=False)
+    assert_array_equal(read_only, X)
+    assert_allclose(ours.transform(np.asfortranarray(X)), expected)
+    X_int = np.round(X * 10).astype(np.int64)
+    assert_allclose(ours.transform(X_int), ref.transform(X_int))
+
+
+def test_transform_many(backend):
+    rng = np.random.RandomState(7)
+    train = pd.DataFrame(rng.randn(100, 3) * 4 + 1, columns=['a', 'b', 'c'])
+    ours = StandardScaler().fit(train)
+    ref = SklearnStandardScaler().fit(train.to_numpy())
+
+    # Columns in another order, plus columns the scaler has not seen
+    batch = train.iloc[:10, ::-1].copy()
+    batch['label'] = list('xyzxyzxyzx')
+    batch['other'] = np.arange(10)
+    expected = ref.transform(train.iloc[:10].to_numpy())
+
+    out = ours.transform_many(batch)
+    assert out is batch
+    assert list(out.columns) == ['c', 'b', 'a', 'label', 'other']
+    assert_allclose(out[['a', 'b', 'c']].to_numpy(), expected)
+    assert list(out['label']) == list('xyzxyzxyzx')
+    assert_array_equal(out['other'], np.arange(10))
+
+
+def test_transform_many_requires_dataframe_fit():
+    X = np.random.RandomState(8).randn(20, 2)
+    with pytest.raises(NotFittedError):
+        StandardScaler().transform_many(pd.DataFrame(X))
+    with pytest.raises(ValueError, match='fitted on a DataFrame'):
+        StandardScaler().fit(X).transform_many(pd.DataFrame(X))
+
+
+@pytest.mark.parametrize('with_mean, with_std', [(True, True), (True, False),
+                                                 (False, True),
+                                                 (False, False)])
+def test_inverse_transform_copy(backend, with_mean, with_std):
+    X = np.random.RandomState(9).randn(40, 5) * 2 + 3
+    ours = StandardScaler(with_mean=with_mean, with_std=with_std).fit(X)
+    X_tr = ours.transform(X)
+
+    kept = X_tr.copy()
+    X_inv = ours.inverse_transform(X_tr, copy=True)
+    assert X_inv is not X_tr
+    assert_array_equal(X_tr, kept)
+    assert_allclose(X_inv, X)
+
+    X_inv = ours.inverse_transform(X_tr, copy=False)
+    assert X_inv is X_tr
+    assert_allclose(X_tr, X)
+
+
+@pytest.mark.parametrize('dtype, rtol', [(np.float64, 1e-10),
+                                         (np.float32, 1e-5)])
+def test_numpy_transform_in_tiles(monkeypatch, dtype, rtol):
+    monkeypatch.setattr(sklearn_transformers, 'njit', None)
+    monkeypatch.setattr(sklearn_transformers, 'numexpr', None)
+    X = (np.random.RandomState(10).randn(10000, 10) * 3 + 2).astype(dtype)
+    # Several tiles, the last one partial
+    n_rows = StandardScaler._TILE_BYTES // (X.shape[1] * X.itemsize)
+    assert X.shape[0] > n_rows and X.shape[0] % n_rows
+    ours = StandardScaler().fit(X)
+    ref = SklearnStandardScaler().fit(X)
+    assert_allclose(ours.transform(X), ref.transform(X), rtol=rtol, atol=rtol)